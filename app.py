@@ -5,18 +5,21 @@ Orchestrates all NLP modules and serves the chat UI.
 
 from flask import Flask, render_template, request, jsonify, session
 import os
+import time
 
-from faq_data import FAQS
-from preprocessor import preprocess
-from synonym_matcher import synonym_match
-from tfidf_retriever import retriever
-from intent_classifier import classify_intent
-from entity_extractor import extract_entities
 from context_manager import ConversationContext
-from fallback_handler import generate_fallback, is_greeting, HIGH_CONFIDENCE
+from faq_store import store
+from load_shedder import shedder, answer_cache
+from pipeline import run_pipeline
+from tfidf_retriever import retriever
+from request_profiler import profiled
+from interaction_logger import interaction_log
 
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
+interaction_log.start()
+
+FAQ_CACHE_MAX_AGE = 300  # seconds clients may reuse /faqs responses before revalidating
 
 
 @app.route("/")
@@ -27,9 +30,10 @@ def index():
 
 
 @app.route("/chat", methods=["POST"])
+@profiled
 def chat():
     """
-    Handle a chat message.
+    Handle a chat message (see pipeline.run_pipeline).
     Pipeline:
       1. Check for greetings
       2. Preprocess + extract entities
@@ -38,6 +42,8 @@ def chat():
       5. Retrieve best FAQ via TF-IDF
       6. Fallback if confidence too low
       7. Return response with metadata
+    Under load the request is admitted in a degraded mode (see load_shedder)
+    and the response carries `degraded` / `degradation` flags.
     """
     data = request.get_json()
     user_message = data.get("message", "").strip()
@@ -50,86 +56,73 @@ def chat():
     ctx_data = session.get("context")
     ctx = ConversationContext.from_dict(ctx_data) if ctx_data else ConversationContext()
 
-    # ── 1. Check greetings ────────────────────────────────────────────────
-    greeting_reply = is_greeting(user_message)
-    if greeting_reply:
-        ctx.update("greeting", {}, user_message)
-        session["context"] = ctx.to_dict()
-        return jsonify({
-            "reply": greeting_reply,
-            "intent": "greeting",
-            "entities": {},
-            "confidence": 1.0
-        })
-
-    # ── 2. Extract entities ───────────────────────────────────────────────
-    entities = extract_entities(user_message)
-
-    # ── 3. Classify intent ────────────────────────────────────────────────
-    intent, intent_conf = classify_intent(user_message)
-
-    # ── 4. Resolve follow-ups ─────────────────────────────────────────────
-    resolved_intent, resolved_entities = ctx.resolve_followup(
-        user_message, intent, entities, intent_conf
-    )
-
-    # ── 5. TF-IDF retrieval ───────────────────────────────────────────────
-    top_results = retriever.retrieve(user_message, top_k=3)
-    best_faq, best_score = top_results[0] if top_results else (None, 0.0)
-
-    # Also try synonym matching
-    syn_faq, syn_score = synonym_match(user_message)
-
-    # Pick the best between TF-IDF and synonym matching
-    if syn_faq and syn_score > best_score:
-        best_faq = syn_faq
-        best_score = max(syn_score, best_score)
-
-    # ── 6. Determine response ─────────────────────────────────────────────
-    if best_faq and best_score >= HIGH_CONFIDENCE:
-        reply = best_faq["answer"]
-
-        # Enrich with entity context
-        entity_notes = []
-        if resolved_entities.get("semester"):
-            entity_notes.append(f"📌 Semester: {resolved_entities['semester']}")
-        if resolved_entities.get("year"):
-            entity_notes.append(f"📌 Year: {resolved_entities['year']}")
-        if resolved_entities.get("course_codes"):
-            entity_notes.append(f"📌 Course: {', '.join(resolved_entities['course_codes'])}")
-        if resolved_entities.get("dates"):
-            entity_notes.append(f"📌 Date reference: {', '.join(resolved_entities['dates'])}")
-
-        if entity_notes:
-            reply += "\n\n" + "\n".join(entity_notes)
-
-        # Update context
-        ctx.update(resolved_intent, resolved_entities, user_message, best_faq["id"])
-        session["context"] = ctx.to_dict()
-
-        return jsonify({
-            "reply": reply,
-            "intent": resolved_intent,
-            "entities": resolved_entities,
-            "confidence": round(best_score, 3),
-            "faq_id": best_faq["id"]
-        })
-
-    # ── 7. Fallback ───────────────────────────────────────────────────────
-    fallback = generate_fallback(user_message, top_results)
-    ctx.update(resolved_intent, resolved_entities, user_message)
+    with shedder.admit() as ticket:
+        response = run_pipeline(user_message, ctx, ticket)
+        latency_ms = ticket.elapsed_ms()
+
+    interaction_log.log({
+        "ts": time.time(),
+        "query": user_message,
+        "faq_id": response.get("faq_id"),
+        "score": response.get("confidence"),
+        "intent": response.get("intent"),
+        "fallback_type": response.get("fallback_type"),
+        "degradation": response.get("degradation"),
+        "latency_ms": round(latency_ms, 3)
+    })
+
     session["context"] = ctx.to_dict()
+    return jsonify(response)
+
 
+@app.route("/metrics")
+def metrics():
+    """Expose load-shedding, cache and logger counters."""
     return jsonify({
-        "reply": fallback["reply"],
-        "intent": resolved_intent,
-        "entities": resolved_entities,
-        "confidence": round(best_score, 3),
-        "fallback_type": fallback["type"],
-        "suggestions": fallback.get("suggestions", [])
+        "load": shedder.stats(),
+        "answer_cache": answer_cache.stats(),
+        "semantic_cache": retriever.cache.stats(),
+        "interaction_log": interaction_log.stats()
     })
 
 
+def _cacheable_json(etag: str, build_payload):
+    """
+    JSON response with a strong ETag. If the client already holds this
+    version (If-None-Match), answer 304 without building the payload.
+    """
+    if request.if_none_match.contains_weak(etag):
+        response = app.response_class(status=304)
+    else:
+        response = jsonify(build_payload())
+    response.set_etag(etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = FAQ_CACHE_MAX_AGE
+    return response
+
+
+def _faq_payload(faq) -> dict:
+    return {"id": faq.id, "question": faq.question, "answer": faq.answer, "intent": faq.intent}
+
+
+@app.route("/faqs")
+def faq_catalogue():
+    """Read-only FAQ catalogue, versioned by the corpus hash."""
+    return _cacheable_json(store.version, lambda: {
+        "version": store.version,
+        "faqs": [_faq_payload(faq) for faq in store]
+    })
+
+
+@app.route("/faqs/<int:faq_id>")
+def faq_detail(faq_id):
+    """A single FAQ by id, e.g. when a student clicks a suggestion."""
+    faq = store.by_id(faq_id)
+    if faq is None:
+        return jsonify({"error": "FAQ not found"}), 404
+    return _cacheable_json(f"{store.version}-{faq_id}", lambda: _faq_payload(faq))
+
+
 @app.route("/reset", methods=["POST"])
 def reset():
     """Reset conversation context."""
@@ -0,0 +1,160 @@
+"""
+bulk_answer.py — Offline bulk answering of collected student questions.
+Streams questions from a file, fans fixed-size chunks out to worker
+processes that run the same pipeline as /chat (with one batched TF-IDF
+retrieval per chunk), and writes one JSONL result per question in input
+order, followed by throughput stats on stderr. At most PENDING_PER_WORKER
+chunks per worker are in flight, so memory stays bounded however large
+the input is.
+
+Input is either plain text (one question per line) or JSONL with a
+"query" or "message" field; a line that starts with "{" but is not valid
+JSON is treated as plain text.
+
+Usage:
+    python bulk_answer.py questions.txt -o answers.jsonl --workers 8
+"""
+
+from __future__ import annotations
+
+
+import argparse
+import itertools
+import json
+import os
+import sys
+import time
+from collections import Counter, deque
+from multiprocessing import Pool
+
+from context_manager import ConversationContext
+from pipeline import run_pipeline
+from tfidf_retriever import retriever
+
+CHUNK_SIZE = 256
+PENDING_PER_WORKER = 2     # chunks submitted ahead of the writer, per worker
+
+
+def read_questions(lines):
+    """Yield (line_no, question) from plain-text or JSONL lines, skipping blanks."""
+    for line_no, line in enumerate(lines, 1):
+        text = line.strip()
+        if not text:
+            continue
+        if text.startswith("{"):
+            try:
+                item = json.loads(text)
+            except json.JSONDecodeError:
+                item = None
+            if isinstance(item, dict):
+                text = str(item.get("query") or item.get("message") or "").strip()
+                if not text:
+                    continue
+        yield line_no, text
+
+
+def chunked(iterable, size: int):
+    """Yield successive lists of up to `size` items without materializing the input."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def answer_chunk(chunk: list[tuple[int, str]]) -> list[dict]:
+    """Worker: answer one chunk of questions as independent single-turn chats."""
+    tfidf_batch = retriever.retrieve_batch([question for _, question in chunk])
+
+    results = []
+    for (line_no, question), tfidf_results in zip(chunk, tfidf_batch):
+        response = run_pipeline(question, ConversationContext(),
+                                tfidf_results=tfidf_results)
+        results.append({
+            "line": line_no,
+            "query": question,
+            "faq_id": response.get("faq_id"),
+            "intent": response.get("intent"),
+            "confidence": response.get("confidence"),
+            "fallback_type": response.get("fallback_type"),
+            "entities": response.get("entities", {}),
+            "suggestions": [s["id"] for s in response.get("suggestions", [])]
+        })
+    return results
+
+
+def outcome(record: dict) -> str:
+    """Classify a result: answered (an FAQ was served), greeting, or its fallback type."""
+    if record["faq_id"] is not None:
+        return "answered"
+    if record["intent"] == "greeting":
+        return "greeting"
+    return record["fallback_type"] or "unanswered"
+
+
+def ordered_results(pool, chunks, window: int):
+    """
+    Submit chunks with apply_async, keeping at most `window` in flight, and
+    yield their results in submission order.
+    """
+    pending = deque()
+    for chunk in chunks:
+        pending.append(pool.apply_async(answer_chunk, (chunk,)))
+        if len(pending) >= window:
+            yield pending.popleft().get()
+    while pending:
+        yield pending.popleft().get()
+
+
+def run_bulk(lines, out, workers: int | None = None, chunk_size: int = CHUNK_SIZE) -> dict:
+    """
+    Answer every question from `lines`, writing ordered JSONL to `out`.
+    Returns throughput and outcome stats.
+    """
+    outcomes = Counter()
+    total = 0
+    started = time.perf_counter()
+    window = PENDING_PER_WORKER * (workers or os.cpu_count() or 1)
+
+    with Pool(processes=workers) as pool:
+        chunks = chunked(read_questions(lines), chunk_size)
+        for results in ordered_results(pool, chunks, window):
+            for record in results:
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                outcomes[outcome(record)] += 1
+            total += len(results)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "questions": total,
+        "elapsed_s": round(elapsed, 3),
+        "questions_per_s": round(total / elapsed, 1) if elapsed else 0.0,
+        "outcomes": dict(outcomes)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Answer a file of questions in bulk.")
+    parser.add_argument("input", help="questions file (text or JSONL), '-' for stdin")
+    parser.add_argument("-o", "--output", default="-", help="JSONL output path (default: stdout)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE,
+                        help="questions per worker task / TF-IDF batch")
+    args = parser.parse_args()
+
+    src = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    out = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        stats = run_bulk(src, out, args.workers, args.chunk_size)
+    finally:
+        if src is not sys.stdin:
+            src.close()
+        if out is not sys.stdout:
+            out.close()
+
+    print(json.dumps(stats), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+evaluate.py — Offline accuracy-versus-latency evaluation harness.
+Runs a labeled query set through the chat pipeline under a grid of
+configurations (retrieval engine × HIGH/LOW confidence thresholds) and
+reports recall@k, intent accuracy, fallback rates and per-query latency
+side by side. Configurations are evaluated in parallel worker processes.
+
+Usage:
+    python evaluate.py eval_queries.jsonl --engine hybrid tfidf --high 0.3 0.35 --low 0.15
+"""
+
+from __future__ import annotations
+
+
+import argparse
+import itertools
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from context_manager import ConversationContext
+from fallback_handler import HIGH_CONFIDENCE, LOW_CONFIDENCE
+from pipeline import ENGINES, retrieve_candidates, run_pipeline
+
+FALLBACK_TYPES = ("suggestion", "clarification", "handover")
+CHUNK_SIZE = 64
+
+
+def load_labeled_queries(path: str) -> list[dict]:
+    """
+    Load a JSONL query set. Each line: {"query": ..., "faq_id": ..., "intent": ...}
+    where faq_id/intent are null for out-of-scope queries.
+    """
+    labeled = []
+    with open(path, encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            item = json.loads(line)
+            if not item.get("query", "").strip():
+                raise ValueError(f"{path}:{line_no}: missing 'query'")
+            labeled.append(item)
+    return labeled
+
+
+def _ranked_ids(query: str, engine: str, k: int) -> list[int]:
+    """FAQ ids in the order the pipeline would consider them (best first)."""
+    top_results, best_faq, _ = retrieve_candidates(query, engine, top_k=k, use_cache=False)
+    ranked = [best_faq.id] if best_faq else []
+    for faq, score in top_results:
+        if score > 0.0 and faq.id not in ranked:
+            ranked.append(faq.id)
+    return ranked[:k]
+
+
+def _evaluate_chunk(config: dict, labeled: list[dict]) -> list[dict]:
+    """Worker: run one chunk of queries under one configuration."""
+    records = []
+    for item in labeled:
+        query = item["query"].strip()
+        ctx = ConversationContext()  # labeled queries are independent turns
+
+        start = time.perf_counter()
+        response = run_pipeline(query, ctx, engine=config["engine"],
+                                high_confidence=config["high"],
+                                low_confidence=config["low"],
+                                use_cache=config["cache"])
+        latency_ms = (time.perf_counter() - start) * 1000.0
+
+        records.append({
+            "query": query,
+            "expected_faq": item.get("faq_id"),
+            "expected_intent": item.get("intent"),
+            "faq_id": response.get("faq_id"),
+            "intent": response.get("intent"),
+            "fallback_type": response.get("fallback_type"),
+            "ranked": _ranked_ids(query, config["engine"], config["k"]),
+            "latency_ms": latency_ms
+        })
+    return records
+
+
+def _percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    idx = max(0, min(len(ordered) - 1, math.ceil(pct / 100.0 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+def summarize(config: dict, records: list[dict]) -> dict:
+    """Aggregate per-query records into quality and latency metrics."""
+    in_scope = [r for r in records if r["expected_faq"] is not None]
+    out_scope = [r for r in records if r["expected_faq"] is None]
+    with_intent = [r for r in records if r["expected_intent"] is not None]
+    latencies = [r["latency_ms"] for r in records]
+    k = config["k"]
+
+    def rate(hits: int, total: int) -> float:
+        return round(hits / total, 3) if total else 0.0
+
+    summary = {
+        **config,
+        "queries": len(records),
+        "recall@1": rate(sum(r["ranked"][:1] == [r["expected_faq"]] for r in in_scope), len(in_scope)),
+        f"recall@{k}": rate(sum(r["expected_faq"] in r["ranked"] for r in in_scope), len(in_scope)),
+        "answer_accuracy": rate(sum(r["faq_id"] == r["expected_faq"] for r in in_scope), len(in_scope)),
+        "intent_accuracy": rate(sum(r["intent"] == r["expected_intent"] for r in with_intent), len(with_intent)),
+        "answered": rate(sum(r["faq_id"] is not None for r in records), len(records)),
+        "false_answer": rate(sum(r["faq_id"] is not None for r in out_scope), len(out_scope)),
+    }
+    for fallback_type in FALLBACK_TYPES:
+        summary[fallback_type] = rate(
+            sum(r["fallback_type"] == fallback_type for r in records), len(records)
+        )
+    if latencies:
+        summary.update({
+            "latency_mean_ms": round(sum(latencies) / len(latencies), 3),
+            "latency_p50_ms": round(_percentile(latencies, 50), 3),
+            "latency_p95_ms": round(_percentile(latencies, 95), 3),
+            "latency_max_ms": round(max(latencies), 3)
+        })
+    return summary
+
+
+def evaluate(labeled: list[dict], configs: list[dict], workers: int | None = None) -> list[dict]:
+    """
+    Evaluate every configuration over the labeled set, fanning chunks of
+    (configuration, queries) out to a process pool.
+    Returns one summary dict per configuration, in input order.
+    """
+    chunks = [labeled[i:i + CHUNK_SIZE] for i in range(0, len(labeled), CHUNK_SIZE)]
+    records = [[] for _ in configs]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            (ci, pool.submit(_evaluate_chunk, config, chunk))
+            for ci, config in enumerate(configs)
+            for chunk in chunks
+        ]
+        for ci, future in futures:
+            records[ci].extend(future.result())
+
+    return [summarize(config, recs) for config, recs in zip(configs, records)]
+
+
+def build_configs(engines: list[str], highs: list[float], lows: list[float], k: int,
+                  cache: bool = False) -> list[dict]:
+    """Cartesian product of engines and thresholds, skipping low > high."""
+    return [
+        {"engine": engine, "high": high, "low": low, "k": k, "cache": cache}
+        for engine, high, low in itertools.product(engines, highs, lows)
+        if low <= high
+    ]
+
+
+def print_report(summaries: list[dict], k: int):
+    """Print a fixed-width comparison table."""
+    columns = ["engine", "high", "low", "recall@1", f"recall@{k}", "answer_accuracy",
+               "intent_accuracy", "answered", "false_answer", *FALLBACK_TYPES,
+               "latency_p50_ms", "latency_p95_ms"]
+    widths = [max(len(c), 8) for c in columns]
+    print("  ".join(c.ljust(w) for c, w in zip(columns, widths)))
+    for s in summaries:
+        print("  ".join(str(s.get(c, "")).ljust(w) for c, w in zip(columns, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate FAQ pipeline accuracy vs latency.")
+    parser.add_argument("queries", nargs="?", default="eval_queries.jsonl",
+                        help="labeled JSONL query set")
+    parser.add_argument("--engine", nargs="+", default=["hybrid"], choices=ENGINES)
+    parser.add_argument("--high", nargs="+", type=float, default=[HIGH_CONFIDENCE],
+                        help="HIGH_CONFIDENCE values to try")
+    parser.add_argument("--low", nargs="+", type=float, default=[LOW_CONFIDENCE],
+                        help="LOW_CONFIDENCE values to try")
+    parser.add_argument("-k", type=int, default=3, help="k for recall@k")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (use 1 for the cleanest latency numbers)")
+    parser.add_argument("--semantic-cache", action="store_true",
+                        help="keep the retriever's semantic cache on (results then depend on query order)")
+    parser.add_argument("--json", dest="json_out", help="also write summaries to this file")
+    args = parser.parse_args()
+
+    labeled = load_labeled_queries(args.queries)
+    configs = build_configs(args.engine, args.high, args.low, args.k, args.semantic_cache)
+    if not configs:
+        parser.error("no valid configurations (every --low is above every --high)")
+
+    summaries = evaluate(labeled, configs, args.workers)
+    print_report(summaries, args.k)
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump(summaries, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
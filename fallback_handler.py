@@ -7,7 +7,10 @@ related FAQ suggestions, and human advisor routing.
 from __future__ import annotations
 
 
-from faq_data import FAQS
+from lexicon import GREETINGS
+from faq_store import FAQRecord
+from phrase_matcher import MessageHits, scan_message
+from preprocessor import STOPWORDS
 
 # ── Confidence thresholds ─────────────────────────────────────────────────────
 HIGH_CONFIDENCE = 0.35
@@ -21,13 +24,15 @@ ADVISOR_INFO = {
 }
 
 
-def generate_fallback(query: str, top_results: list[tuple[dict, float]]) -> dict:
+def generate_fallback(query: str, top_results: list[tuple[FAQRecord, float]],
+                      low_confidence: float = LOW_CONFIDENCE) -> dict:
     """
     Generate an appropriate fallback response based on match confidence.
 
     Args:
         query: The user's original query
         top_results: List of (faq, score) from TF-IDF retriever
+        low_confidence: Suggestion threshold (defaults to LOW_CONFIDENCE)
 
     Returns:
         dict with 'reply', 'type' ('clarification' | 'suggestion' | 'handover'),
@@ -36,13 +41,13 @@ def generate_fallback(query: str, top_results: list[tuple[dict, float]]) -> dict
     best_score = top_results[0][1] if top_results else 0.0
 
     # ── Case 1: Somewhat relevant — suggest related FAQs ─────────────────
-    if best_score >= LOW_CONFIDENCE:
+    if best_score >= low_confidence:
         suggestions = []
         for faq, score in top_results[:3]:
-            if score >= LOW_CONFIDENCE * 0.5:
+            if score >= low_confidence * 0.5:
                 suggestions.append({
-                    "question": faq["question"],
-                    "id": faq["id"],
+                    "question": faq.question,
+                    "id": faq.id,
                     "score": round(score, 3)
                 })
 
@@ -62,7 +67,7 @@ def generate_fallback(query: str, top_results: list[tuple[dict, float]]) -> dict
             }
 
     # ── Case 2: Very low confidence — ask for clarification ───────────────
-    if best_score >= LOW_CONFIDENCE * 0.3:
+    if best_score >= low_confidence * 0.3:
         return {
             "reply": (
                 "😅 I didn't quite get that. Could you rephrase your question?\n\n"
@@ -94,19 +99,16 @@ def generate_fallback(query: str, top_results: list[tuple[dict, float]]) -> dict
     }
 
 
-def is_greeting(query: str) -> str | None:
-    """Check if the query is a greeting and return an appropriate response."""
-    greetings = {
-        "hi": "Hello! 👋 Welcome to the Institute FAQ Bot. How can I help you today?",
-        "hello": "Hi there! 👋 I'm your institute FAQ assistant. What would you like to know?",
-        "hey": "Hey! 👋 I'm here to answer your questions about the institute. Ask away!",
-        "good morning": "Good morning! ☀️ How can I assist you today?",
-        "good afternoon": "Good afternoon! How can I help you?",
-        "good evening": "Good evening! What can I help you with?",
-        "thanks": "You're welcome! 😊 Feel free to ask anything else.",
-        "thank you": "Happy to help! 😊 Is there anything else you'd like to know?",
-        "bye": "Goodbye! 👋 Have a great day! Feel free to come back anytime.",
-        "goodbye": "See you later! 👋 Don't hesitate to ask if you have more questions.",
-    }
-    lower = query.lower().strip().rstrip("!.,?")
-    return greetings.get(lower)
+def is_greeting(query: str, hits: MessageHits | None = None) -> str | None:
+    """
+    Check if the query is a greeting and return an appropriate response.
+    Only a message that is essentially just a greeting — every other token
+    is a stopword ("hi there", "thank you!") — gets a greeting reply;
+    anything with more content ("hello, can I get a refund?") goes through
+    the normal pipeline.
+    """
+    if hits is None:
+        hits = scan_message(query)
+    if hits.only_greeting(STOPWORDS):
+        return GREETINGS[hits.greetings[0]]
+    return None
@@ -0,0 +1,248 @@
+"""
+faq_store.py — Compact columnar storage for the FAQ corpus.
+Instead of one dict (of strings, lists and nested dicts) per FAQ, fields are
+kept in flat columns: integer arrays for ids/intents/offsets, shared tuples
+of interned keyword/synonym strings, and all question + answer text in one
+contiguous UTF-8 buffer. FAQRecord is a lightweight `__slots__` view onto a
+single row. A store can be saved to disk and re-opened with the text buffer
+memory-mapped, so large corpora are paged in on demand.
+
+Build a store file:
+    python faq_store.py faqs.bin
+and point the app at it with FAQ_STORE_PATH=faqs.bin.
+"""
+
+from __future__ import annotations
+
+
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+MAGIC = b"FAQSTORE1\0"
+_HEADER = struct.Struct("<Q")  # length of the JSON column block
+
+
+class FAQRecord:
+    """Read-only view of one FAQ row in a FAQStore."""
+
+    __slots__ = ("_store", "_idx")
+
+    def __init__(self, store: FAQStore, idx: int):
+        self._store = store
+        self._idx = idx
+
+    @property
+    def index(self) -> int:
+        """Row position in the store (also the TF-IDF matrix row)."""
+        return self._idx
+
+    @property
+    def id(self) -> int:
+        return self._store.ids[self._idx]
+
+    @property
+    def question(self) -> str:
+        offsets = self._store.text_offsets
+        return self._store.text(offsets[2 * self._idx], offsets[2 * self._idx + 1])
+
+    @property
+    def answer(self) -> str:
+        offsets = self._store.text_offsets
+        return self._store.text(offsets[2 * self._idx + 1], offsets[2 * self._idx + 2])
+
+    @property
+    def keywords(self) -> tuple[str, ...]:
+        offsets = self._store.keyword_offsets
+        return self._store.keywords[offsets[self._idx]:offsets[self._idx + 1]]
+
+    @property
+    def intent(self) -> str:
+        return self._store.intent_names[self._store.intent_codes[self._idx]]
+
+    @property
+    def synonyms(self) -> dict[str, list[str]]:
+        store = self._store
+        groups = {}
+        for g in range(store.group_offsets[self._idx], store.group_offsets[self._idx + 1]):
+            start, end = store.term_offsets[g], store.term_offsets[g + 1]
+            groups[store.group_canonical[g]] = list(store.terms[start:end])
+        return groups
+
+    def to_dict(self) -> dict:
+        """Materialize the row in the original faq_data dict shape."""
+        return {
+            "id": self.id,
+            "question": self.question,
+            "answer": self.answer,
+            "keywords": list(self.keywords),
+            "intent": self.intent,
+            "synonyms": self.synonyms
+        }
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, FAQRecord)
+                and other._store is self._store and other._idx == self._idx)
+
+    def __hash__(self) -> int:
+        return hash((id(self._store), self._idx))
+
+    def __repr__(self) -> str:
+        return f"FAQRecord(id={self.id}, question={self.question!r})"
+
+
+class FAQStore:
+    """Columnar, optionally memory-mapped FAQ corpus."""
+
+    def __init__(self, columns: dict, text_buffer, version: str | None = None):
+        self.ids = array("i", columns["ids"])
+        self.intent_names = tuple(columns["intent_names"])
+        self.intent_codes = array("B", columns["intent_codes"])
+        # Row i: question = [2i, 2i+1), answer = [2i+1, 2i+2) in the text buffer
+        self.text_offsets = array("Q", columns["text_offsets"])
+        self.keyword_offsets = array("I", columns["keyword_offsets"])
+        self.keywords = tuple(sys.intern(k) for k in columns["keywords"])
+        self.group_offsets = array("I", columns["group_offsets"])
+        self.group_canonical = tuple(sys.intern(c) for c in columns["group_canonical"])
+        self.term_offsets = array("I", columns["term_offsets"])
+        self.terms = tuple(sys.intern(t) for t in columns["terms"])
+
+        self._buffer = text_buffer
+        # Content hash of columns + text — changes whenever the corpus does.
+        # Stores opened with load() pass the version saved with the file, so
+        # the mmapped text is not read end to end just to hash it.
+        self.version = version or self._content_hash(columns, text_buffer)
+        self._records = tuple(FAQRecord(self, i) for i in range(len(self.ids)))
+        self._row_by_id = {faq_id: i for i, faq_id in enumerate(self.ids)}
+
+    @staticmethod
+    def _content_hash(columns: dict, text_buffer) -> str:
+        digest = hashlib.sha256(json.dumps(columns, sort_keys=True).encode("utf-8"))
+        digest.update(text_buffer)
+        return digest.hexdigest()[:16]
+
+    # ── Construction ──────────────────────────────────────────────────────
+    @classmethod
+    def from_faqs(cls, faqs: list[dict]) -> FAQStore:
+        """Build a store from faq_data-style dicts."""
+        columns = {key: [] for key in (
+            "ids", "intent_names", "intent_codes", "text_offsets", "keyword_offsets",
+            "keywords", "group_offsets", "group_canonical", "term_offsets", "terms"
+        )}
+        text = bytearray()
+        columns["text_offsets"].append(0)
+        columns["keyword_offsets"].append(0)
+        columns["group_offsets"].append(0)
+        columns["term_offsets"].append(0)
+
+        for faq in faqs:
+            columns["ids"].append(faq["id"])
+
+            intent = faq["intent"]
+            if intent not in columns["intent_names"]:
+                columns["intent_names"].append(intent)
+            columns["intent_codes"].append(columns["intent_names"].index(intent))
+
+            for field in ("question", "answer"):
+                text += faq[field].encode("utf-8")
+                columns["text_offsets"].append(len(text))
+
+            columns["keywords"].extend(faq["keywords"])
+            columns["keyword_offsets"].append(len(columns["keywords"]))
+
+            for canonical, synonyms in faq.get("synonyms", {}).items():
+                columns["group_canonical"].append(canonical)
+                columns["terms"].extend(synonyms)
+                columns["term_offsets"].append(len(columns["terms"]))
+            columns["group_offsets"].append(len(columns["group_canonical"]))
+
+        return cls(columns, bytes(text))
+
+    @classmethod
+    def load(cls, path: str, use_mmap: bool = True) -> FAQStore:
+        """Open a store written by save(); the text buffer is mmapped by default."""
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a FAQ store file")
+            (meta_len,) = _HEADER.unpack(f.read(_HEADER.size))
+            columns = json.loads(f.read(meta_len).decode("utf-8"))
+            version = columns.pop("version", None)
+            text_start = len(MAGIC) + _HEADER.size + meta_len
+
+            if use_mmap:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                buffer = memoryview(mapped)[text_start:]
+            else:
+                buffer = f.read()
+
+        return cls(columns, buffer, version)
+
+    def save(self, path: str):
+        """Write the store as: magic, JSON column block (with version), raw text buffer."""
+        columns = {
+            "ids": self.ids.tolist(),
+            "intent_names": list(self.intent_names),
+            "intent_codes": self.intent_codes.tolist(),
+            "text_offsets": self.text_offsets.tolist(),
+            "keyword_offsets": self.keyword_offsets.tolist(),
+            "keywords": list(self.keywords),
+            "group_offsets": self.group_offsets.tolist(),
+            "group_canonical": list(self.group_canonical),
+            "term_offsets": self.term_offsets.tolist(),
+            "terms": list(self.terms),
+            "version": self.version
+        }
+        meta = json.dumps(columns, ensure_ascii=False).encode("utf-8")
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(_HEADER.pack(len(meta)))
+            f.write(meta)
+            f.write(self._buffer)
+
+    # ── Access ────────────────────────────────────────────────────────────
+    def text(self, start: int, end: int) -> str:
+        """Decode a slice of the shared text buffer."""
+        return bytes(self._buffer[start:end]).decode("utf-8")
+
+    def by_id(self, faq_id: int) -> FAQRecord | None:
+        row = self._row_by_id.get(faq_id)
+        return self._records[row] if row is not None else None
+
+    def __getitem__(self, idx: int) -> FAQRecord:
+        return self._records[idx]
+
+    def __iter__(self):
+        return iter(self._records)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+def load_default_store() -> FAQStore:
+    """
+    Open FAQ_STORE_PATH if set, otherwise build from faq_data.FAQS.
+    faq_data is only imported in the second case, so a memory-mapped store
+    never materializes the per-FAQ dicts.
+    """
+    path = os.environ.get("FAQ_STORE_PATH")
+    if path:
+        return FAQStore.load(path)
+
+    from faq_data import FAQS
+    return FAQStore.from_faqs(FAQS)
+
+
+# Singleton instance — shared by the retriever, matchers and the app
+store = load_default_store()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        sys.exit("usage: python faq_store.py OUTPUT_PATH")
+    from faq_data import FAQS
+    FAQStore.from_faqs(FAQS).save(sys.argv[1])
+    print(f"Wrote {len(FAQS)} FAQs to {sys.argv[1]}")
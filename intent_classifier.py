@@ -4,60 +4,25 @@ Routes student queries to one of 7 intent buckets:
   admissions, exams, timetable, hostel, scholarships, facilities, general
 """
 
-from preprocessor import preprocess
+from __future__ import annotations
 
-# ── Intent keyword definitions ────────────────────────────────────────────────
-INTENT_KEYWORDS = {
-    "admissions": [
-        "admission", "admissions", "apply", "application", "enroll",
-        "registration", "join", "intake", "eligibility", "entrance",
-        "cutoff", "merit", "counseling", "form"
-    ],
-    "exams": [
-        "exam", "examination", "test", "assessment", "paper",
-        "datesheet", "result", "marks", "grade", "semester",
-        "internal", "external", "midterm", "final", "backlog",
-        "revaluation", "supplementary"
-    ],
-    "timetable": [
-        "timetable", "schedule", "class", "lecture", "period",
-        "routine", "slot", "calendar"
-    ],
-    "hostel": [
-        "hostel", "accommodation", "room", "mess", "dormitory",
-        "stay", "residence", "boarding", "warden", "curfew"
-    ],
-    "scholarships": [
-        "scholarship", "financial", "aid", "merit", "concession",
-        "waiver", "bursary", "grant", "stipend", "freeships"
-    ],
-    "facilities": [
-        "library", "book", "sports", "gym", "ground", "fitness",
-        "placement", "job", "recruit", "career", "bus", "transport",
-        "shuttle", "wifi", "internet", "canteen", "food", "cafeteria",
-        "lab", "computer", "pool", "swimming"
-    ],
-    "general": [
-        "timings", "timing", "hours", "contact", "phone", "email",
-        "address", "office", "ragging", "bully", "harassment",
-        "principal", "dean", "faculty", "department", "fees",
-        "tuition", "payment", "cost"
-    ]
-}
+from lexicon import INTENT_KEYWORDS
+from phrase_matcher import MessageHits, scan_message
 
 
-def classify_intent(query: str) -> tuple[str, float]:
+def classify_intent(query: str, hits: MessageHits | None = None) -> tuple[str, float]:
     """
     Classify the intent of a query using weighted keyword matching.
+    Keyword hits come from the shared phrase matcher scan.
     Returns (intent_label, confidence_score).
     """
-    tokens = preprocess(query)
-    token_set = set(tokens)
+    if hits is None:
+        hits = scan_message(query)
 
     scores = {}
     for intent, keywords in INTENT_KEYWORDS.items():
         keyword_set = set(keywords)
-        matched = token_set & keyword_set
+        matched = hits.intent_keywords.get(intent, set())
         if keyword_set:
             scores[intent] = len(matched) / len(keyword_set) * 10  # boost raw count
         else:
@@ -0,0 +1,203 @@
+"""
+interaction_logger.py — Non-blocking structured log of chat interactions.
+Request threads push small dicts onto a bounded in-memory queue; a
+background writer thread serializes them in batches and appends them to a
+JSONL file that rotates by size (rotated files optionally gzip-compressed).
+When the queue is full the configured policy either drops the record or
+blocks the caller for a bounded time. Pending records are flushed on
+shutdown.
+
+Configuration (environment):
+  FAQ_LOG_DIR          output directory (default: ./logs); empty disables logging
+  FAQ_LOG_POLICY       "drop" (default) or "block" when the queue is full
+  FAQ_LOG_COMPRESS     "1" to gzip rotated files
+"""
+
+from __future__ import annotations
+
+
+import atexit
+import gzip
+import json
+import os
+import queue
+import shutil
+import threading
+import time
+
+LOG_DIR = os.environ.get("FAQ_LOG_DIR", "logs")
+LOG_POLICY = os.environ.get("FAQ_LOG_POLICY", "drop")
+LOG_COMPRESS = os.environ.get("FAQ_LOG_COMPRESS", "") == "1"
+
+QUEUE_SIZE = 10_000
+BATCH_SIZE = 256
+FLUSH_INTERVAL = 1.0            # seconds between flushes when idle
+BLOCK_TIMEOUT = 0.05            # max seconds a request waits under "block"
+MAX_FILE_BYTES = 64 * 1024 * 1024
+LOG_NAME = "interactions"
+
+DROP = "drop"
+BLOCK = "block"
+
+_STOP = object()
+
+
+class InteractionLogger:
+    """Bounded queue + background batch writer producing rotating JSONL files."""
+
+    def __init__(self, directory: str = LOG_DIR, policy: str = LOG_POLICY,
+                 compress: bool = LOG_COMPRESS, queue_size: int = QUEUE_SIZE,
+                 batch_size: int = BATCH_SIZE, max_bytes: int = MAX_FILE_BYTES):
+        if policy not in (DROP, BLOCK):
+            raise ValueError(f"Unknown queue-full policy: {policy!r}")
+        self.directory = directory
+        self.policy = policy
+        self.compress = compress
+        self.batch_size = batch_size
+        self.max_bytes = max_bytes
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._file = None
+        self._lock = threading.Lock()
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.errors = 0
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.directory)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, LOG_NAME + ".jsonl")
+
+    # ── Request-thread side ───────────────────────────────────────────────
+    def log(self, record: dict):
+        """Enqueue a record; never does file I/O on the caller's thread."""
+        if not self.enabled:
+            return
+        try:
+            if self.policy == BLOCK:
+                self._queue.put(record, timeout=BLOCK_TIMEOUT)
+            else:
+                self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────
+    def start(self):
+        """Start the writer thread (idempotent) and flush on interpreter exit."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            self._thread = threading.Thread(target=self._run, name="interaction-logger",
+                                            daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def close(self, timeout: float = 5.0):
+        """Flush everything queued so far and stop the writer thread."""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is None or not thread.is_alive():
+            return
+        try:
+            self._queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            return  # writer is not keeping up; don't hang interpreter exit
+        thread.join(timeout)
+
+    # ── Writer thread ─────────────────────────────────────────────────────
+    def _run(self):
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=FLUSH_INTERVAL)
+                except queue.Empty:
+                    continue
+
+                batch, stop = [], item is _STOP
+                if not stop:
+                    batch.append(item)
+                while not stop and len(batch) < self.batch_size:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stop = True
+                    else:
+                        batch.append(item)
+
+                if batch:
+                    self._write(batch)
+                if stop:
+                    break
+        finally:
+            self._close_file()
+
+    def _write(self, batch: list[dict]):
+        """
+        Append a batch, rotating when the file is full. I/O errors are
+        counted rather than raised, and the file is reopened on the next
+        batch, so one failure never kills the writer thread.
+        """
+        try:
+            if self._file is None:
+                self._file = open(self.path, "a", encoding="utf-8")
+            lines = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in batch)
+            self._file.write(lines)
+            self._file.flush()
+        except (OSError, ValueError):
+            self.errors += 1
+            self.dropped += len(batch)
+            self._close_file()
+            return
+
+        self.written += len(batch)
+        try:
+            if self._file.tell() >= self.max_bytes:
+                self._rotate()
+        except OSError:
+            self.errors += 1
+            self._close_file()
+
+    def _close_file(self):
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError:
+                self.errors += 1
+            self._file = None
+
+    def _rotate(self):
+        """Move the current file aside (optionally gzipped); the next batch opens a new one."""
+        self._close_file()
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        rotated = os.path.join(self.directory, f"{LOG_NAME}-{stamp}-{self.rotations}.jsonl")
+        os.replace(self.path, rotated)
+        self.rotations += 1
+
+        if self.compress:
+            with open(rotated, "rb") as src, gzip.open(rotated + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+            os.remove(rotated)
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize(),
+            "written": self.written,
+            "dropped": self.dropped,
+            "rotations": self.rotations,
+            "errors": self.errors,
+            "policy": self.policy
+        }
+
+
+# Singleton instance — started by the Flask app
+interaction_log = InteractionLogger()
@@ -0,0 +1,58 @@
+"""
+lexicon.py — Greeting phrases and intent keyword sets.
+Kept apart from faq_data so the phrase matcher, greeting check and intent
+classifier can load them without building the FAQ corpus.
+"""
+
+# ── Intent keyword definitions ────────────────────────────────────────────────
+INTENT_KEYWORDS = {
+    "admissions": [
+        "admission", "admissions", "apply", "application", "enroll",
+        "registration", "join", "intake", "eligibility", "entrance",
+        "cutoff", "merit", "counseling", "form"
+    ],
+    "exams": [
+        "exam", "examination", "test", "assessment", "paper",
+        "datesheet", "result", "marks", "grade", "semester",
+        "internal", "external", "midterm", "final", "backlog",
+        "revaluation", "supplementary"
+    ],
+    "timetable": [
+        "timetable", "schedule", "class", "lecture", "period",
+        "routine", "slot", "calendar"
+    ],
+    "hostel": [
+        "hostel", "accommodation", "room", "mess", "dormitory",
+        "stay", "residence", "boarding", "warden", "curfew"
+    ],
+    "scholarships": [
+        "scholarship", "financial", "aid", "merit", "concession",
+        "waiver", "bursary", "grant", "stipend", "freeships"
+    ],
+    "facilities": [
+        "library", "book", "sports", "gym", "ground", "fitness",
+        "placement", "job", "recruit", "career", "bus", "transport",
+        "shuttle", "wifi", "internet", "canteen", "food", "cafeteria",
+        "lab", "computer", "pool", "swimming"
+    ],
+    "general": [
+        "timings", "timing", "hours", "contact", "phone", "email",
+        "address", "office", "ragging", "bully", "harassment",
+        "principal", "dean", "faculty", "department", "fees",
+        "tuition", "payment", "cost"
+    ]
+}
+
+# ── Greeting phrases and replies ──────────────────────────────────────────────
+GREETINGS = {
+    "hi": "Hello! 👋 Welcome to the Institute FAQ Bot. How can I help you today?",
+    "hello": "Hi there! 👋 I'm your institute FAQ assistant. What would you like to know?",
+    "hey": "Hey! 👋 I'm here to answer your questions about the institute. Ask away!",
+    "good morning": "Good morning! ☀️ How can I assist you today?",
+    "good afternoon": "Good afternoon! How can I help you?",
+    "good evening": "Good evening! What can I help you with?",
+    "thanks": "You're welcome! 😊 Feel free to ask anything else.",
+    "thank you": "Happy to help! 😊 Is there anything else you'd like to know?",
+    "bye": "Goodbye! 👋 Have a great day! Feel free to come back anytime.",
+    "goodbye": "See you later! 👋 Don't hesitate to ask if you have more questions.",
+}
@@ -0,0 +1,175 @@
+"""
+load_shedder.py — Admission control and graceful degradation under load.
+Tracks in-flight /chat requests and a moving average of their latency, and
+steps requests down to cheaper pipeline modes when the server is saturated:
+  full → synonym (skip TF-IDF) → cached (recent answers only) → handover
+"""
+
+from __future__ import annotations
+
+
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from faq_store import FAQRecord
+
+# ── Pipeline modes (most expensive first) ─────────────────────────────────────
+FULL = "full"
+SYNONYM_ONLY = "synonym"
+CACHED = "cached"
+HANDOVER = "handover"
+MODES = (FULL, SYNONYM_ONLY, CACHED, HANDOVER)
+
+# ── Admission thresholds ──────────────────────────────────────────────────────
+REQUEST_BUDGET_MS = 250.0   # latency budget for a single /chat request
+SYNONYM_DEPTH = 8           # in-flight requests before TF-IDF is skipped
+CACHED_DEPTH = 16           # in-flight requests before only cached answers are served
+HANDOVER_DEPTH = 32         # in-flight requests before replying with handover info
+LATENCY_ALPHA = 0.2         # smoothing factor for the latency moving average
+ANSWER_CACHE_SIZE = 256
+
+
+class Ticket:
+    """Admission record for one request: its pipeline mode and deadline."""
+
+    def __init__(self, mode: str, budget_ms: float):
+        self.mode = mode
+        self.started = time.perf_counter()
+        self.deadline = self.started + budget_ms / 1000.0
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000.0
+
+    def expired(self) -> bool:
+        """True once the request has used up its latency budget."""
+        return time.perf_counter() >= self.deadline
+
+    def degrade(self, mode: str):
+        """Step down to a cheaper mode (never back up)."""
+        if MODES.index(mode) > MODES.index(self.mode):
+            self.mode = mode
+
+    def serve_full(self):
+        """Record that the full reply was served regardless of the admitted mode."""
+        self.mode = FULL
+
+    @property
+    def degraded(self) -> bool:
+        return self.mode != FULL
+
+    def to_dict(self) -> dict:
+        """Response metadata describing whether degradation happened."""
+        return {
+            "degraded": self.degraded,
+            "degradation": self.mode if self.degraded else None
+        }
+
+
+class LoadShedder:
+    """Chooses a pipeline mode per request from queue depth and latency."""
+
+    def __init__(self, budget_ms: float = REQUEST_BUDGET_MS,
+                 synonym_depth: int = SYNONYM_DEPTH,
+                 cached_depth: int = CACHED_DEPTH,
+                 handover_depth: int = HANDOVER_DEPTH):
+        self.budget_ms = budget_ms
+        self.synonym_depth = synonym_depth
+        self.cached_depth = cached_depth
+        self.handover_depth = handover_depth
+
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.avg_latency_ms = 0.0
+        self.counters = {mode: 0 for mode in MODES}
+        self.deadline_misses = 0
+
+    def _choose_mode(self) -> str:
+        """Pick the cheapest mode required by the current load (lock held)."""
+        depth = self.in_flight
+        latency = self.avg_latency_ms
+
+        if depth >= self.handover_depth:
+            return HANDOVER
+        if depth >= self.cached_depth or latency >= 2 * self.budget_ms:
+            return CACHED
+        if depth >= self.synonym_depth or latency >= self.budget_ms:
+            return SYNONYM_ONLY
+        return FULL
+
+    @contextmanager
+    def admit(self):
+        """
+        Admit a request for the duration of the `with` block.
+        Yields a Ticket whose mode the handler must honour; latency and the
+        final mode are recorded when the block exits.
+        """
+        with self._lock:
+            mode = self._choose_mode()
+            self.in_flight += 1
+
+        ticket = Ticket(mode, self.budget_ms)
+        try:
+            yield ticket
+        finally:
+            elapsed = ticket.elapsed_ms()
+            with self._lock:
+                self.in_flight -= 1
+                self.avg_latency_ms += LATENCY_ALPHA * (elapsed - self.avg_latency_ms)
+                self.counters[ticket.mode] += 1
+                if elapsed > self.budget_ms:
+                    self.deadline_misses += 1
+
+    def stats(self) -> dict:
+        """Snapshot of load and degradation counters."""
+        with self._lock:
+            total = sum(self.counters.values())
+            degraded = total - self.counters[FULL]
+            return {
+                "in_flight": self.in_flight,
+                "avg_latency_ms": round(self.avg_latency_ms, 3),
+                "requests": total,
+                "degraded": degraded,
+                "modes": dict(self.counters),
+                "deadline_misses": self.deadline_misses
+            }
+
+
+class AnswerCache:
+    """Small thread-safe LRU of recent confident answers, keyed by normalized query."""
+
+    def __init__(self, maxsize: int = ANSWER_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str) -> tuple[FAQRecord, float] | None:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key: str, faq: FAQRecord, score: float):
+        if not key:
+            return
+        with self._lock:
+            self._data[key] = (faq, score)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+
+# Singleton instances — shared by all request threads
+shedder = LoadShedder()
+answer_cache = AnswerCache()
@@ -0,0 +1,169 @@
+"""
+phrase_matcher.py — Aho-Corasick phrase matching over message tokens.
+One automaton, compiled once at import, holds every greeting phrase,
+synonym phrase (including multi-word ones like "working hours"), FAQ
+keyword and intent keyword, plus their common misspellings. A single
+linear scan of a message yields all hits for the greeting, intent and
+synonym stages.
+"""
+
+from __future__ import annotations
+
+
+from faq_store import store
+from lexicon import GREETINGS, INTENT_KEYWORDS
+from preprocessor import SPELLING_CORRECTIONS, tokenize
+
+# ── Hit kinds ─────────────────────────────────────────────────────────────────
+GREETING = "greeting"   # value: GREETINGS key
+SYNONYM = "synonym"     # value: canonical term
+TERM = "term"           # value: FAQ keyword
+INTENT = "intent"       # value: (intent, keyword)
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton whose alphabet is word tokens, not characters."""
+
+    def __init__(self):
+        self._goto = [{}]       # state → {token: next state}
+        self._fail = [0]
+        self._output = [[]]     # state → [(phrase length, payload), ...]
+        self._compiled = False
+
+    def add(self, tokens: tuple[str, ...], payload):
+        """Register a phrase (as a token tuple) with a payload."""
+        if self._compiled:
+            raise RuntimeError("cannot add phrases after compile()")
+        if not tokens:
+            return
+        state = 0
+        for token in tokens:
+            nxt = self._goto[state].get(token)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][token] = nxt
+            state = nxt
+        self._output[state].append((len(tokens), payload))
+
+    def compile(self):
+        """Compute failure links breadth-first and merge outputs along them."""
+        queue = list(self._goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for token, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and token not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(token, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._output[nxt] = self._output[nxt] + self._output[self._fail[nxt]]
+        self._compiled = True
+
+    def scan(self, tokens: list[str]):
+        """Yield (start, end, payload) for every phrase occurrence in tokens."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for i, token in enumerate(tokens):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for length, payload in output[state]:
+                yield i - length + 1, i + 1, payload
+
+
+class MessageHits:
+    """Everything the matcher found in one message, grouped by stage."""
+
+    def __init__(self, tokens: list[str]):
+        self.tokens = tokens
+        self.greetings = []         # GREETINGS keys, in message order
+        self.greeting_positions = set()  # token indices covered by greeting phrases
+        self.synonyms = set()       # canonical terms reached via synonyms
+        self.terms = set()          # FAQ keywords present in the message
+        self.intent_keywords = {}   # intent → set of matched keywords
+
+    def only_greeting(self, filler: set[str]) -> bool:
+        """True if the message is a greeting whose other tokens are all in `filler`."""
+        return bool(self.greetings) and all(
+            token in filler for i, token in enumerate(self.tokens)
+            if i not in self.greeting_positions
+        )
+
+
+def _misspellings() -> dict[str, list[str]]:
+    """Invert SPELLING_CORRECTIONS: correct token → known misspellings."""
+    variants = {}
+    for wrong, right in SPELLING_CORRECTIONS.items():
+        variants.setdefault(right, []).append(wrong)
+    return variants
+
+
+def _spelling_variants(tokens: tuple[str, ...], misspellings: dict[str, list[str]]):
+    """Yield the phrase plus every single-token misspelling of it."""
+    yield tokens
+    for i, token in enumerate(tokens):
+        for wrong in misspellings.get(token, ()):
+            yield tokens[:i] + (wrong,) + tokens[i + 1:]
+
+
+def synonym_phrases() -> dict[str, str]:
+    """Flat synonym phrase → canonical term map from the store's synonym groups."""
+    phrases = {}
+    for faq in store:
+        for canonical, synonyms in faq.synonyms.items():
+            for syn in synonyms:
+                phrases[syn.lower()] = canonical.lower()
+            phrases[canonical.lower()] = canonical.lower()
+    return phrases
+
+
+def build_message_matcher() -> PhraseMatcher:
+    """Compile greetings, synonyms, FAQ keywords and intent keywords into one automaton."""
+    misspellings = _misspellings()
+    matcher = PhraseMatcher()
+
+    def add(phrase: str, payload):
+        for variant in _spelling_variants(tuple(tokenize(phrase)), misspellings):
+            matcher.add(variant, payload)
+
+    for phrase in GREETINGS:
+        add(phrase, (GREETING, phrase))
+    for phrase, canonical in synonym_phrases().items():
+        add(phrase, (SYNONYM, canonical))
+    for keyword in {k.lower() for faq in store for k in faq.keywords}:
+        add(keyword, (TERM, keyword))
+    for intent, keywords in INTENT_KEYWORDS.items():
+        for keyword in keywords:
+            add(keyword, (INTENT, (intent, keyword)))
+
+    matcher.compile()
+    return matcher
+
+
+def scan_message(text: str) -> MessageHits:
+    """Tokenize a message and collect every phrase hit in one pass."""
+    tokens = tokenize(text)
+    hits = MessageHits(tokens)
+    for start, end, (kind, value) in message_matcher.scan(tokens):
+        if kind == TERM:
+            hits.terms.add(value)
+        elif kind == SYNONYM:
+            hits.synonyms.add(value)
+        elif kind == INTENT:
+            intent, keyword = value
+            hits.intent_keywords.setdefault(intent, set()).add(keyword)
+        else:
+            hits.greeting_positions.update(range(start, end))
+            if value not in hits.greetings:
+                hits.greetings.append(value)
+    return hits
+
+
+# Singleton instance — compiled once at import time
+message_matcher = build_message_matcher()
@@ -0,0 +1,193 @@
+"""
+pipeline.py — The chat answering pipeline, independent of Flask.
+Used by the /chat route and by offline tools so they all run the same
+greeting → entities → intent → context → retrieval → fallback steps.
+"""
+
+from __future__ import annotations
+
+
+from faq_store import FAQRecord
+from phrase_matcher import MessageHits, scan_message
+from preprocessor import preprocess_to_string
+from synonym_matcher import synonym_match
+from tfidf_retriever import retriever
+from intent_classifier import classify_intent
+from entity_extractor import extract_entities
+from context_manager import ConversationContext
+from fallback_handler import generate_fallback, is_greeting, HIGH_CONFIDENCE, LOW_CONFIDENCE
+from load_shedder import answer_cache, Ticket, FULL, SYNONYM_ONLY, HANDOVER
+
+# ── Retrieval engines ─────────────────────────────────────────────────────────
+ENGINES = ("hybrid", "tfidf", "synonym")
+
+
+def retrieve_candidates(query: str, engine: str = "hybrid", top_k: int = 3,
+                        hits: MessageHits | None = None, use_cache: bool = True,
+                        tfidf_results: list[tuple[FAQRecord, float]] | None = None
+                        ) -> tuple[list[tuple[FAQRecord, float]], FAQRecord | None, float]:
+    """
+    Run the selected retrieval engine(s) for a query.
+    Returns (ranked TF-IDF results, best_faq, best_score); the best match is
+    whichever of TF-IDF and synonym matching scored higher.
+    `tfidf_results` supplies precomputed TF-IDF rankings (e.g. from
+    retriever.retrieve_batch) instead of retrieving here.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown retrieval engine: {engine!r}")
+
+    top_results = []
+    best_faq, best_score = None, 0.0
+
+    if engine in ("hybrid", "tfidf"):
+        if tfidf_results is not None:
+            top_results = tfidf_results[:top_k]
+        else:
+            top_results = retriever.retrieve(query, top_k=top_k, use_cache=use_cache)
+        best_faq, best_score = top_results[0] if top_results else (None, 0.0)
+
+    if engine in ("hybrid", "synonym"):
+        syn_faq, syn_score = synonym_match(query, hits)
+        if syn_faq and syn_score > best_score:
+            best_faq = syn_faq
+            best_score = syn_score
+
+    return top_results, best_faq, best_score
+
+
+def run_pipeline(user_message: str, ctx: ConversationContext,
+                 ticket: Ticket | None = None, engine: str = "hybrid",
+                 high_confidence: float = HIGH_CONFIDENCE,
+                 low_confidence: float = LOW_CONFIDENCE,
+                 use_cache: bool = True,
+                 tfidf_results: list[tuple[FAQRecord, float]] | None = None) -> dict:
+    """
+    Answer a single (non-empty) message and update `ctx` in place.
+    Pipeline:
+      1. Check for greetings
+      2. Extract entities
+      3. Classify intent
+      4. Resolve follow-ups via context manager
+      5. Retrieve best FAQ via TF-IDF + synonym matching
+      6. Fallback if confidence too low
+    `use_cache=False` bypasses the retriever's semantic cache, and
+    `tfidf_results` passes in precomputed TF-IDF rankings.
+    When a load-shedding `ticket` is given its mode is honoured and the
+    response carries `degraded` / `degradation` flags.
+    Returns the response dict sent to the client.
+    """
+    mode = ticket.mode if ticket else FULL
+    meta = ticket.to_dict() if ticket else {}
+
+    # One phrase-matcher pass feeds the greeting, intent and synonym stages
+    hits = scan_message(user_message)
+
+    # ── 1. Check greetings ────────────────────────────────────────────────
+    greeting_reply = is_greeting(user_message, hits)
+    if greeting_reply:
+        # Greetings are a canned reply — served in full under any load
+        if ticket:
+            ticket.serve_full()
+            meta = ticket.to_dict()
+        ctx.update("greeting", {}, user_message)
+        return {
+            "reply": greeting_reply,
+            "intent": "greeting",
+            "entities": {},
+            "confidence": 1.0,
+            **meta
+        }
+
+    # Saturated — skip NLP entirely and route to a human advisor
+    if mode == HANDOVER:
+        fallback = generate_fallback(user_message, [], low_confidence)
+        return {
+            "reply": fallback["reply"],
+            "intent": None,
+            "entities": {},
+            "confidence": 0.0,
+            "fallback_type": fallback["type"],
+            "suggestions": [],
+            **meta
+        }
+
+    # ── 2. Extract entities ───────────────────────────────────────────────
+    entities = extract_entities(user_message)
+
+    # ── 3. Classify intent ────────────────────────────────────────────────
+    intent, intent_conf = classify_intent(user_message, hits)
+
+    # ── 4. Resolve follow-ups ─────────────────────────────────────────────
+    resolved_intent, resolved_entities = ctx.resolve_followup(
+        user_message, intent, entities, intent_conf
+    )
+
+    # ── 5. Retrieval (full engines, or a cheaper degraded path) ──────────
+    cache_key = preprocess_to_string(user_message)
+    top_results = []
+    best_faq, best_score = None, 0.0
+
+    if ticket and mode == FULL and ticket.expired():
+        ticket.degrade(SYNONYM_ONLY)
+        mode = ticket.mode
+        meta = ticket.to_dict()
+
+    if mode == FULL:
+        top_results, best_faq, best_score = retrieve_candidates(
+            user_message, engine, hits=hits, use_cache=use_cache,
+            tfidf_results=tfidf_results
+        )
+    else:
+        cached = answer_cache.get(cache_key)
+        if cached:
+            best_faq, best_score = cached
+        elif mode == SYNONYM_ONLY:
+            best_faq, best_score = synonym_match(user_message, hits)
+
+    # Degraded paths have no ranked list — let the fallback see the best guess
+    if not top_results and best_faq:
+        top_results = [(best_faq, best_score)]
+
+    # ── 6. Determine response ─────────────────────────────────────────────
+    if best_faq and best_score >= high_confidence:
+        answer_cache.put(cache_key, best_faq, best_score)
+        reply = best_faq.answer
+
+        # Enrich with entity context
+        entity_notes = []
+        if resolved_entities.get("semester"):
+            entity_notes.append(f"📌 Semester: {resolved_entities['semester']}")
+        if resolved_entities.get("year"):
+            entity_notes.append(f"📌 Year: {resolved_entities['year']}")
+        if resolved_entities.get("course_codes"):
+            entity_notes.append(f"📌 Course: {', '.join(resolved_entities['course_codes'])}")
+        if resolved_entities.get("dates"):
+            entity_notes.append(f"📌 Date reference: {', '.join(resolved_entities['dates'])}")
+
+        if entity_notes:
+            reply += "\n\n" + "\n".join(entity_notes)
+
+        ctx.update(resolved_intent, resolved_entities, user_message, best_faq.id)
+
+        return {
+            "reply": reply,
+            "intent": resolved_intent,
+            "entities": resolved_entities,
+            "confidence": round(best_score, 3),
+            "faq_id": best_faq.id,
+            **meta
+        }
+
+    # ── 7. Fallback ───────────────────────────────────────────────────────
+    fallback = generate_fallback(user_message, top_results, low_confidence)
+    ctx.update(resolved_intent, resolved_entities, user_message)
+
+    return {
+        "reply": fallback["reply"],
+        "intent": resolved_intent,
+        "entities": resolved_entities,
+        "confidence": round(best_score, 3),
+        "fallback_type": fallback["type"],
+        "suggestions": fallback.get("suggestions", []),
+        **meta
+    }
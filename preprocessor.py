@@ -76,6 +76,13 @@ SPELLING_CORRECTIONS = {
 }
 
 
+def tokenize(text: str) -> list[str]:
+    """Lowercase, strip punctuation (keeping hyphens) and split on whitespace."""
+    text = text.lower().strip()
+    text = re.sub(r"[^\w\s\-]", " ", text)
+    return text.split()
+
+
 def preprocess(text: str) -> list[str]:
     """
     Full preprocessing pipeline:
@@ -86,14 +93,9 @@ def preprocess(text: str) -> list[str]:
     5. Stopword removal
     Returns a list of cleaned tokens.
     """
-    # 1. Lowercase
-    text = text.lower().strip()
-
-    # 2. Remove punctuation except hyphens (useful for course codes)
-    text = re.sub(r"[^\w\s\-]", " ", text)
-
-    # 3. Tokenize
-    tokens = text.split()
+    # 1-3. Lowercase, remove punctuation except hyphens (useful for
+    # course codes), tokenize
+    tokens = tokenize(text)
 
     # 4. Spelling correction
     tokens = [SPELLING_CORRECTIONS.get(tok, tok) for tok in tokens]
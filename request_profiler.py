@@ -0,0 +1,138 @@
+"""
+request_profiler.py — Opt-in per-request profiling for Flask views.
+A sampled request (random sampling rate, or a privileged `X-Profile` header
+carrying the configured token) runs under cProfile; the raw profile and a
+text summary of the hottest functions are written to PROFILE_DIR.
+When neither trigger is configured the decorator returns the view
+unchanged, so disabled profiling adds no overhead at all.
+
+Configuration (environment):
+  FAQ_PROFILE_SAMPLE_RATE   fraction of requests to profile, e.g. 0.01
+  FAQ_PROFILE_TOKEN         secret that enables profiling via `X-Profile`
+  FAQ_PROFILE_DIR           output directory (default: ./profiles)
+"""
+
+from __future__ import annotations
+
+
+import cProfile
+import functools
+import hmac
+import io
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+
+from flask import request, make_response
+
+PROFILE_SAMPLE_RATE = float(os.environ.get("FAQ_PROFILE_SAMPLE_RATE", "0") or 0)
+PROFILE_TOKEN = os.environ.get("FAQ_PROFILE_TOKEN", "")
+PROFILE_DIR = os.environ.get("FAQ_PROFILE_DIR", "profiles")
+PROFILE_HEADER = "X-Profile"
+TOP_FUNCTIONS = 25
+
+# Pipeline stages always reported in the summary, as (file path suffix, function).
+# Matching on the defining file keeps same-named functions elsewhere (e.g.
+# sklearn's nested `transform` chain) from being counted into a stage.
+WATCHED_FUNCTIONS = (
+    ("pipeline.py", "run_pipeline"),
+    ("phrase_matcher.py", "scan_message"),
+    ("fallback_handler.py", "is_greeting"),
+    ("preprocessor.py", "preprocess"),
+    ("entity_extractor.py", "extract_entities"),
+    ("intent_classifier.py", "classify_intent"),
+    ("context_manager.py", "resolve_followup"),
+    ("tfidf_retriever.py", "retrieve"),
+    ("sklearn/metrics/pairwise.py", "cosine_similarity"),
+    ("synonym_matcher.py", "synonym_match"),
+    ("fallback_handler.py", "generate_fallback")
+)
+
+# cProfile cannot run in two threads at once — profile one request at a time
+_profile_lock = threading.Lock()
+
+
+def profiling_enabled() -> bool:
+    return PROFILE_SAMPLE_RATE > 0 or bool(PROFILE_TOKEN)
+
+
+def _should_profile() -> bool:
+    """Decide whether the current request is sampled."""
+    if PROFILE_TOKEN:
+        header = request.headers.get(PROFILE_HEADER, "")
+        # Compare bytes: compare_digest rejects non-ASCII str arguments
+        if header and hmac.compare_digest(header.encode("utf-8"),
+                                          PROFILE_TOKEN.encode("utf-8")):
+            return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def summarize_profile(profile: cProfile.Profile, top_n: int = TOP_FUNCTIONS) -> str:
+    """Render the watched pipeline stages plus the top functions by cumulative time."""
+    stats = pstats.Stats(profile)
+
+    stages = {}
+    for (filename, _, name), (_, ncalls, _, cumtime, _) in stats.stats.items():
+        path = filename.replace(os.sep, "/")
+        for suffix, watched in WATCHED_FUNCTIONS:
+            if name == watched and (path == suffix or path.endswith("/" + suffix)):
+                calls, total = stages.get((suffix, name), (0, 0.0))
+                stages[(suffix, name)] = (calls + ncalls, total + cumtime)
+
+    out = io.StringIO()
+    out.write("Pipeline stages (cumulative):\n")
+    for key in WATCHED_FUNCTIONS:
+        if key in stages:
+            calls, total = stages[key]
+            label = f"{key[0].rsplit('/', 1)[-1][:-3]}.{key[1]}"
+            out.write(f"  {label:<34} {total * 1000:9.3f} ms  ({calls} calls)\n")
+    out.write("\n")
+
+    stats.stream = out
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top_n)
+    return out.getvalue()
+
+
+def dump_profile(profile: cProfile.Profile, label: str) -> str:
+    """Write `<name>.prof` and `<name>.txt` under PROFILE_DIR; return the base name."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe_label = label.strip("/").replace("/", "_") or "root"
+    name = f"{time.strftime('%Y%m%d-%H%M%S')}-{safe_label}-{uuid.uuid4().hex[:8]}"
+    base = os.path.join(PROFILE_DIR, name)
+
+    profile.dump_stats(base + ".prof")
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        f.write(f"{request.method} {request.path}\n\n")
+        f.write(summarize_profile(profile))
+    return name
+
+
+def profiled(view):
+    """
+    Decorate a Flask view so sampled requests are profiled and dumped.
+    The response of a profiled request carries an `X-Profile-File` header.
+    """
+    if not profiling_enabled():
+        return view
+
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if not _should_profile() or not _profile_lock.acquire(blocking=False):
+            return view(*args, **kwargs)
+
+        try:
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                response = make_response(view(*args, **kwargs))
+            finally:
+                profile.disable()
+            response.headers["X-Profile-File"] = dump_profile(profile, request.path)
+            return response
+        finally:
+            _profile_lock.release()
+
+    return wrapper
@@ -1,3 +1,4 @@
 flask>=3.0
 scikit-learn>=1.3
+numpy>=1.24
 nltk>=3.8
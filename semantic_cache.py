@@ -0,0 +1,127 @@
+"""
+semantic_cache.py — Paraphrase-tolerant cache of retrieval decisions.
+Keeps the TF-IDF vectors of recently answered queries in a small dense
+NumPy matrix. A new query whose vector is within a cosine-similarity
+threshold of a cached one reuses that query's candidate FAQ rows, so
+rewordings like "what r the fees" / "fee amount?" skip full retrieval:
+only the few cached rows are re-scored against the new query. A sample of
+hits is re-checked against full retrieval to estimate the false-hit rate.
+"""
+
+from __future__ import annotations
+
+
+import random
+import threading
+import time
+
+import numpy as np
+
+SEMANTIC_CACHE_SIZE = 512
+SEMANTIC_CACHE_THRESHOLD = 0.9
+VERIFY_RATE = 0.05          # fraction of hits re-checked against full retrieval
+LATENCY_ALPHA = 0.1         # smoothing factor for the latency moving averages
+
+
+class SemanticCache:
+    """Bounded LRU of (query vector → candidate FAQ rows) entries."""
+
+    def __init__(self, n_features: int, capacity: int = SEMANTIC_CACHE_SIZE,
+                 threshold: float = SEMANTIC_CACHE_THRESHOLD,
+                 verify_rate: float = VERIFY_RATE):
+        self.capacity = capacity
+        self.threshold = threshold
+        self.verify_rate = verify_rate
+
+        # Rows are L2-normalized, so a dot product is the cosine similarity
+        self._vectors = np.zeros((capacity, n_features), dtype=np.float32)
+        self._rows = [None] * capacity
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._size = 0
+        self._clock = 0
+        self._lock = threading.Lock()
+
+        self.lookups = 0
+        self.hits = 0
+        self.verified = 0
+        self.false_hits = 0
+        self.avg_miss_ms = 0.0
+        self.avg_hit_ms = 0.0
+
+    @staticmethod
+    def _dense(query_vec) -> np.ndarray:
+        """Dense, L2-normalized float32 row from a (sparse) 1×n vector."""
+        vec = np.asarray(query_vec.toarray() if hasattr(query_vec, "toarray") else query_vec,
+                         dtype=np.float32).ravel()
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def lookup(self, query_vec) -> tuple[list[int] | None, np.ndarray]:
+        """
+        Return (cached candidate rows or None, dense query vector).
+        The dense vector can be passed back to store() on a miss.
+        """
+        vec = self._dense(query_vec)
+        with self._lock:
+            self.lookups += 1
+            if self._size == 0 or not vec.any():
+                return None, vec
+            sims = self._vectors[:self._size] @ vec
+            slot = int(sims.argmax())
+            if sims[slot] < self.threshold:
+                return None, vec
+            self._clock += 1
+            self._last_used[slot] = self._clock
+            self.hits += 1
+            return self._rows[slot], vec
+
+    def store(self, vec: np.ndarray, rows: list[int]):
+        """Insert candidate rows, evicting the least recently used entry when full."""
+        if not vec.any():
+            return
+        with self._lock:
+            if self._size < self.capacity:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(self._last_used.argmin())
+            self._clock += 1
+            self._vectors[slot] = vec
+            self._rows[slot] = rows
+            self._last_used[slot] = self._clock
+
+    def should_verify(self) -> bool:
+        return self.verify_rate > 0 and random.random() < self.verify_rate
+
+    def record_verification(self, cached_order: list[int], actual_order: list[int]):
+        """Count a hit as false if its re-scored order differs from full retrieval."""
+        with self._lock:
+            self.verified += 1
+            if cached_order != actual_order:
+                self.false_hits += 1
+
+    def record_latency(self, hit: bool, started: float):
+        """Fold one lookup's wall time (from `started`) into the hit/miss averages."""
+        elapsed = (time.perf_counter() - started) * 1000.0
+        with self._lock:
+            if hit:
+                self.avg_hit_ms += LATENCY_ALPHA * (elapsed - self.avg_hit_ms)
+            else:
+                self.avg_miss_ms += LATENCY_ALPHA * (elapsed - self.avg_miss_ms)
+
+    def stats(self) -> dict:
+        with self._lock:
+            saved_per_hit = max(self.avg_miss_ms - self.avg_hit_ms, 0.0)
+            return {
+                "size": self._size,
+                "capacity": self.capacity,
+                "threshold": self.threshold,
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / self.lookups, 3) if self.lookups else 0.0,
+                "verified": self.verified,
+                "false_hit_rate": round(self.false_hits / self.verified, 3) if self.verified else 0.0,
+                "avg_hit_ms": round(self.avg_hit_ms, 4),
+                "avg_miss_ms": round(self.avg_miss_ms, 4),
+                "saved_ms_total": round(saved_per_hit * self.hits, 3)
+            }
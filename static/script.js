@@ -1,9 +1,12 @@
-ocument.addEventListener("DOMContentLoaded", () => {
+document.addEventListener("DOMContentLoaded", () => {
     const chatMessages = document.getElementById("chatMessages");
     const userInput    = document.getElementById("userInput");
     const sendBtn      = document.getElementById("sendBtn");
     const resetBtn     = document.getElementById("resetBtn");
 
+    // FAQs already fetched via /faqs/<id>, keyed by id
+    const faqCache = new Map();
+
     // ── Send message on Enter or click ───────────────────────────────────
     userInput.addEventListener("keydown", (e) => {
         if (e.key === "Enter" && !e.shiftKey) {
@@ -46,18 +49,18 @@ ocument.addEventListener("DOMContentLoaded", () => {
         const text = userInput.value.trim();
         if (!text) return;
 
-        // Remove welcome card if still showing
-        const welcome = chatMessages.querySelector(".welcome-card");
-        if (welcome) {
-            welcome.style.animation = "fadeOut 0.2s ease forwards";
-            setTimeout(() => welcome.remove(), 200);
-        }
+        dismissWelcome();
 
         // Render user message
         appendMessage("user", text);
         userInput.value = "";
         userInput.focus();
 
+        await askBot(text);
+    }
+
+    // ── Run a message through /chat and render the reply ─────────────────
+    async function askBot(text) {
         // Show typing indicator
         const typingEl = showTypingIndicator();
 
@@ -90,6 +93,36 @@ ocument.addEventListener("DOMContentLoaded", () => {
         }
     }
 
+    // ── Answer a clicked suggestion without re-running NLP ───────────────
+    async function showFaq(faqId, question) {
+        dismissWelcome();
+        appendMessage("user", question);
+
+        try {
+            let faq = faqCache.get(faqId);
+            if (!faq) {
+                // Browser HTTP cache revalidates with If-None-Match (ETag)
+                const response = await fetch(`/faqs/${faqId}`);
+                if (!response.ok) throw new Error(`HTTP ${response.status}`);
+                faq = await response.json();
+                faqCache.set(faqId, faq);
+            }
+            appendMessage("bot", faq.answer, { intent: faq.intent });
+        } catch (err) {
+            // Fall back to the full chat pipeline; the question is already shown
+            await askBot(question);
+        }
+    }
+
+    // ── Remove welcome card if still showing ─────────────────────────────
+    function dismissWelcome() {
+        const welcome = chatMessages.querySelector(".welcome-card");
+        if (welcome) {
+            welcome.style.animation = "fadeOut 0.2s ease forwards";
+            setTimeout(() => welcome.remove(), 200);
+        }
+    }
+
     // ── Render a message bubble ──────────────────────────────────────────
     function appendMessage(role, text, meta = {}) {
         const row = document.createElement("div");
@@ -135,6 +168,13 @@ ocument.addEventListener("DOMContentLoaded", () => {
             if (chips.length > 0) {
                 metaHTML = `<div class="msg-meta">${chips.join("")}</div>`;
             }
+
+            if (meta.suggestions && meta.suggestions.length) {
+                const buttons = meta.suggestions.map((s) =>
+                    `<button class="suggestion-btn" data-faq-id="${s.id}">${escapeHTML(s.question)}</button>`
+                );
+                metaHTML += `<div class="msg-suggestions">${buttons.join("")}</div>`;
+            }
         }
 
         // Format text: convert \n to line breaks
@@ -150,6 +190,12 @@ ocument.addEventListener("DOMContentLoaded", () => {
             </div>
         `;
 
+        row.querySelectorAll(".suggestion-btn").forEach((btn) => {
+            btn.addEventListener("click", () => {
+                showFaq(Number(btn.getAttribute("data-faq-id")), btn.textContent);
+            });
+        });
+
         chatMessages.appendChild(row);
         scrollToBottom();
     }
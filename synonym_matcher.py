@@ -0,0 +1,67 @@
+"""
+synonym_matcher.py — Synonym-aware keyword matching.
+Expands user query terms using the synonym phrases found by the phrase
+matcher so that semantically similar queries (e.g., "fees", "tuition",
+"payment", "fee structure") map to the same FAQ.
+"""
+
+from __future__ import annotations
+
+
+from faq_store import store, FAQRecord
+from phrase_matcher import MessageHits, scan_message
+
+# Inverted index: lowercase FAQ keyword → FAQ rows that list it
+FAQS_BY_KEYWORD = {}
+for faq in store:
+    for keyword in faq.keywords:
+        FAQS_BY_KEYWORD.setdefault(keyword.lower(), set()).add(faq.index)
+
+
+def expand_with_synonyms(hits: MessageHits) -> set[str]:
+    """
+    Combine the FAQ keywords found in a message with the canonical forms of
+    every synonym phrase it contains (single- or multi-word).
+    """
+    return hits.terms | hits.synonyms
+
+
+def keyword_match_score(query_terms: set[str], faq: FAQRecord) -> float:
+    """
+    Compute a matching score between expanded query terms and FAQ keywords.
+    Returns a score between 0.0 and 1.0.
+    """
+    faq_keywords = set(k.lower() for k in faq.keywords)
+    if not faq_keywords:
+        return 0.0
+    intersection = query_terms & faq_keywords
+    # Jaccard-like score weighted toward FAQ coverage
+    score = len(intersection) / len(faq_keywords)
+    return min(score, 1.0)
+
+
+def synonym_match(query: str, hits: MessageHits | None = None) -> tuple[FAQRecord | None, float]:
+    """
+    Match a user query to the best FAQ using synonym-expanded keyword matching.
+    Only FAQs sharing at least one term with the query are scored.
+    Returns (best_faq, confidence_score) or (None, 0.0) if no match.
+    """
+    if hits is None:
+        hits = scan_message(query)
+    expanded = expand_with_synonyms(hits)
+
+    candidates = set()
+    for term in expanded:
+        candidates |= FAQS_BY_KEYWORD.get(term, set())
+
+    best_faq = None
+    best_score = 0.0
+
+    for idx in sorted(candidates):
+        faq = store[idx]
+        score = keyword_match_score(expanded, faq)
+        if score > best_score:
+            best_score = score
+            best_faq = faq
+
+    return best_faq, best_score
@@ -0,0 +1,115 @@
+"""
+tfidf_retriever.py — TF-IDF based FAQ retrieval engine.
+Builds TF-IDF vectors from the FAQ corpus and uses cosine similarity
+to select the most relevant answer for a student's query, with a
+semantic cache in front for paraphrases of recent queries.
+"""
+
+from __future__ import annotations
+
+
+import time
+
+from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.metrics.pairwise import cosine_similarity
+from faq_store import store, FAQRecord
+from preprocessor import preprocess_to_string
+from semantic_cache import SemanticCache
+
+# Candidate rows are cached this deep so later callers can ask for a larger top_k
+CACHED_TOP_K = 5
+
+
+class TFIDFRetriever:
+    """Retrieval engine that ranks FAQs by TF-IDF cosine similarity."""
+
+    def __init__(self):
+        # Build corpus from FAQ questions + keywords
+        self.corpus = []
+        for faq in store:
+            text = faq.question + " " + " ".join(faq.keywords)
+            self.corpus.append(preprocess_to_string(text))
+
+        self.vectorizer = TfidfVectorizer()
+        self.tfidf_matrix = self.vectorizer.fit_transform(self.corpus)
+        self.cache = SemanticCache(len(self.vectorizer.vocabulary_))
+
+    def _rank(self, query_vec, top_k: int) -> list[tuple[int, float]]:
+        """Full retrieval: cosine similarity against every FAQ, top_k rows."""
+        similarities = cosine_similarity(query_vec, self.tfidf_matrix).flatten()
+        ranked_indices = similarities.argsort(kind="stable")[::-1][:top_k]
+        return [(int(idx), float(similarities[idx])) for idx in ranked_indices]
+
+    def _rescore(self, query_vec, rows: list[int]) -> list[tuple[int, float]]:
+        """
+        Score only the given rows against the query, ordered like _rank().
+        Corpus rows and the query are L2-normalized, so the dot product is
+        the exact cosine similarity.
+        """
+        scores = (self.tfidf_matrix[rows] @ query_vec.T).toarray().ravel()
+        return sorted(((row, float(score)) for row, score in zip(rows, scores)),
+                      key=lambda pair: (pair[1], pair[0]), reverse=True)
+
+    def retrieve(self, query: str, top_k: int = 3,
+                 use_cache: bool = True) -> list[tuple[FAQRecord, float]]:
+        """
+        Retrieve top_k FAQs ranked by cosine similarity to the query.
+        A close paraphrase of a recent query reuses its cached candidate
+        rows, re-scored against this query.
+        Returns list of (faq_record, similarity_score) tuples.
+        """
+        processed_query = preprocess_to_string(query)
+        query_vec = self.vectorizer.transform([processed_query])
+
+        if not use_cache:
+            ranked = self._rank(query_vec, top_k)
+        else:
+            started = time.perf_counter()
+            cached, dense_vec = self.cache.lookup(query_vec)
+            if cached is not None and len(cached) >= min(top_k, len(store)):
+                ranked = self._rescore(query_vec, cached)[:top_k]
+                self.cache.record_latency(True, started)
+                if self.cache.should_verify():
+                    actual = self._rank(query_vec, len(ranked))
+                    self.cache.record_verification([row for row, _ in ranked],
+                                                   [row for row, _ in actual])
+            else:
+                ranked = self._rank(query_vec, max(top_k, CACHED_TOP_K))
+                self.cache.store(dense_vec, [row for row, _ in ranked])
+                ranked = ranked[:top_k]
+                self.cache.record_latency(False, started)
+
+        return [(store[idx], score) for idx, score in ranked]
+
+    def retrieve_batch(self, queries: list[str],
+                       top_k: int = 3) -> list[list[tuple[FAQRecord, float]]]:
+        """
+        Retrieve top_k FAQs for many queries with one vectorizer call and one
+        similarity matrix product (bypasses the semantic cache).
+        Returns one (faq_record, similarity_score) list per query, in order.
+        """
+        if not queries:
+            return []
+        processed = [preprocess_to_string(q) for q in queries]
+        query_matrix = self.vectorizer.transform(processed)
+        similarities = cosine_similarity(query_matrix, self.tfidf_matrix)
+        ranked = similarities.argsort(axis=1, kind="stable")[:, ::-1][:, :top_k]
+
+        return [
+            [(store[idx], float(row_sims[idx])) for idx in row_ranked]
+            for row_sims, row_ranked in zip(similarities, ranked)
+        ]
+
+    def best_match(self, query: str) -> tuple[FAQRecord | None, float]:
+        """
+        Return the single best FAQ match and its confidence score.
+        Returns (None, 0.0) if no meaningful match found.
+        """
+        results = self.retrieve(query, top_k=1)
+        if results and results[0][1] > 0.0:
+            return results[0]
+        return None, 0.0
+
+
+# Singleton instance — initialized once at import time
+retriever = TFIDFRetriever()